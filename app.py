@@ -1,20 +1,22 @@
-import streamlit as st
-import requests
+import datetime
+import hashlib
 import json
+import threading
+import time
+from collections import OrderedDict
+import warnings
+
+import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-import folium
-from streamlit_folium import st_folium
-import datetime
-import asyncio
-import aiohttp
-from concurrent.futures import ThreadPoolExecutor
-import warnings
 warnings.filterwarnings('ignore')
 
+# Shared generator for all simulated data (PCG64; faster than the legacy global RandomState)
+RNG = np.random.default_rng(42)
+
 # --- Advanced Configuration ---
 st.set_page_config(
     page_title="Nexus Weather Intelligence Platform",
@@ -24,7 +26,7 @@ st.set_page_config(
 )
 
 # --- CSS Styling for Professional Look ---
-st.markdown("""
+APP_CSS = """
 <style>
     .main-header {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -66,8 +68,100 @@ st.markdown("""
         background-color: #f8f9fa;
         border-radius: 8px 8px 0 0;
     }
+    .status-grid {
+        display: grid;
+        grid-template-columns: repeat(5, 1fr);
+        gap: 1rem;
+    }
+    .status-tile .status-label {
+        font-size: 0.875rem;
+        opacity: 0.8;
+    }
+    .status-tile .status-value {
+        font-size: 1.75rem;
+    }
+    .status-tile .status-delta {
+        display: inline-block;
+        padding: 0.1rem 0.5rem;
+        border-radius: 1rem;
+        font-size: 0.875rem;
+        color: #09ab3b;
+        background: rgba(9, 171, 59, 0.1);
+    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+HEADER_HTML = """
+<div class="main-header">
+    <h1>🌪️ Nexus Weather Intelligence Platform</h1>
+    <p>Enterprise-Grade Meteorological Analysis & Prediction System</p>
+    <p>Powered by Multi-Model AI Ensemble & Real-Time Data Fusion</p>
+</div>
+"""
+
+FOOTER_HTML = """
+<div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px; color: white;">
+    <h3>🌪️ Nexus Weather Intelligence Platform</h3>
+    <p><strong>Enterprise Meteorological Analysis System</strong></p>
+    <p>Powered by Multi-Source Data Fusion • AI-Enhanced Predictions • Real-Time Risk Assessment</p>
+    <p>Built with: Streamlit • Plotly • Folium • Gemini AI • Advanced Analytics</p>
+    <p><em>Developed for Professional Meteorologists, Emergency Managers, and Research Scientists</em></p>
+</div>
+"""
+
+STATUS_HTML = """
+<div class="status-grid">
+    <div class="status-tile">
+        <div class="status-label">API Status</div>
+        <div class="status-value">🟢 Online</div>
+        <div class="status-delta">↑ 99.97% uptime</div>
+    </div>
+    <div class="status-tile">
+        <div class="status-label">Data Sources</div>
+        <div class="status-value">🟢 Active</div>
+        <div class="status-delta">↑ 5/5 connected</div>
+    </div>
+    <div class="status-tile">
+        <div class="status-label">AI Models</div>
+        <div class="status-value">🟢 Ready</div>
+        <div class="status-delta">↑ All systems operational</div>
+    </div>
+    <div class="status-tile">
+        <div class="status-label">Cache Status</div>
+        <div class="status-value">🟢 Optimal</div>
+        <div class="status-delta">↑ 92% hit rate</div>
+    </div>
+    <div class="status-tile">
+        <div class="status-label">Last Update</div>
+        <div class="status-value">🟢 Current</div>
+        <div class="status-delta">↑ &lt; 1 min ago</div>
+    </div>
+</div>
+"""
+
+# Risk alert banners; a probability strictly above an edge moves up one tier
+ALERT_EDGES = (0.4, 0.7)
+
+ALERT_WARNING_HTML = """
+<div class="alert-warning">
+    <h3>⚠️ Weather Warning</h3>
+    <p><strong>Risk Level:</strong> {risk_level}</p>
+    <p><strong>Probability:</strong> {probability:.1%}</p>
+</div>
+"""
+
+ALERT_CRITICAL_HTML = """
+<div class="alert-critical">
+    <h3>🚨 CRITICAL WEATHER ALERT</h3>
+    <p><strong>Risk Level:</strong> {risk_level}</p>
+    <p><strong>Probability:</strong> {probability:.1%}</p>
+    <p><strong>Immediate Action Required</strong></p>
+</div>
+"""
+
+ALERT_TEMPLATES = (None, ALERT_WARNING_HTML, ALERT_CRITICAL_HTML)
+
+st.markdown(APP_CSS, unsafe_allow_html=True)
 
 # --- API Configuration ---
 WEATHER_APIS = {
@@ -76,7 +170,101 @@ WEATHER_APIS = {
     "noaa": "https://api.weather.gov"
 }
 
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
+GEMINI_STREAM_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:streamGenerateContent"
+
+# Fixed part of every Gemini request; only the user turn changes per call
+GEMINI_REQUEST_CONFIG = {
+    "systemInstruction": {
+        "parts": [{"text": (
+            "You are a senior meteorologist specialising in tropical cyclones and severe weather. "
+            "Ground every statement in the observations provided, state uncertainty explicitly, "
+            "and keep recommendations practical for forecasters and emergency managers."
+        )}]
+    },
+    "generationConfig": {
+        "temperature": 0.3,
+        "topP": 0.8,
+        "topK": 40,
+        "maxOutputTokens": 2048
+    },
+    "safetySettings": [
+        {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+        {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+        {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+        {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    ]
+}
+
+# Pre-encoded JSON around the user prompt; only the prompt is serialized per call
+GEMINI_BODY_PREFIX = (
+    json.dumps(GEMINI_REQUEST_CONFIG)[:-1] + ', "contents": [{"role": "user", "parts": [{"text": '
+).encode()
+GEMINI_BODY_SUFFIX = b'}]}]}'
+
+@st.cache_resource
+def get_http_session():
+    """Shared HTTP session so connections are pooled across reruns"""
+    # Imported here so cold start doesn't pay for requests/urllib3 until a fetch happens
+    import requests_cache
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    from urllib.parse import parse_qs, urlsplit
+    
+    def cache_key(request, **kwargs):
+        # Match on a hash of the API key so a bad key is never answered with another key's response
+        api_key = parse_qs(urlsplit(request.url).query).get("key", [""])[0]
+        key_hash = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        return f"{requests_cache.create_key(request, **kwargs)}-{key_hash}"
+    
+    # On-disk GET cache below st.cache_data; it survives restarts and never stores the API key
+    session = requests_cache.CachedSession(
+        "wx_cache",
+        backend="sqlite",
+        expire_after=300,
+        ignored_parameters=["key"],
+        key_fn=cache_key
+    )
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+            respect_retry_after_header=True
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_weatherapi_current(location, key_hash, time_bucket, _api_key, update_interval=5):
+    """Current conditions from WeatherAPI, memoized per (location, key hash, update window)"""
+    # The on-disk copy expires when this update window rolls over, never later
+    window_end = (time_bucket + 1) * update_interval * 60
+    response = get_http_session().get(
+        f"{WEATHER_APIS['weatherapi']}/current.json",
+        params={"key": _api_key, "q": location, "aqi": "yes"},
+        timeout=5,
+        expire_after=max(1, int(window_end - time.time()))
+    )
+    response.raise_for_status()
+    return response.json()
+
+# --- Selectbox Options ---
+ANALYSIS_TYPES = ("Standard", "Detailed", "Research Grade", "Emergency Response")
+
+AI_ANALYSIS_OPTIONS = (
+    "Comprehensive Weather Analysis",
+    "Cyclone Risk Assessment",
+    "Climate Pattern Analysis",
+    "Agricultural Impact Assessment",
+    "Aviation Weather Briefing",
+    "Marine Weather Analysis",
+    "Emergency Response Planning"
+)
 
 # --- Sidebar Configuration ---
 with st.sidebar:
@@ -106,13 +294,7 @@ with st.sidebar:
         )
 
 # --- Main Header ---
-st.markdown("""
-<div class="main-header">
-    <h1>🌪️ Nexus Weather Intelligence Platform</h1>
-    <p>Enterprise-Grade Meteorological Analysis & Prediction System</p>
-    <p>Powered by Multi-Model AI Ensemble & Real-Time Data Fusion</p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
 # --- Advanced Classes ---
 class WeatherDataProcessor:
@@ -120,20 +302,32 @@ class WeatherDataProcessor:
         self.cache = {}
         self.models = ['GFS', 'ECMWF', 'NAM', 'ICON']
     
-    def fetch_multi_source_data(self, location, api_keys):
+    def fetch_multi_source_data(self, location, api_keys, update_interval=5):
         """Fetch data from multiple sources concurrently"""
+        import requests
+        
         results = {}
+        # Responses are reused until the configured update window rolls over
+        time_bucket = int(time.time() // (update_interval * 60))
         
         # WeatherAPI
         if api_keys.get('weatherapi'):
+            key_hash = hashlib.sha256(api_keys['weatherapi'].encode()).hexdigest()[:16]
             try:
-                response = requests.get(
-                    f"{WEATHER_APIS['weatherapi']}/current.json",
-                    params={"key": api_keys['weatherapi'], "q": location, "aqi": "yes"},
-                    timeout=5
+                results['weatherapi'] = fetch_weatherapi_current(
+                    location, key_hash, time_bucket, api_keys['weatherapi'], update_interval
                 )
-                if response.status_code == 200:
-                    results['weatherapi'] = response.json()
+            except requests.HTTPError as e:
+                # Never show str(e): its URL carries the API key
+                try:
+                    detail = e.response.json()['error']['message']
+                except (ValueError, KeyError, TypeError):
+                    detail = e.response.reason
+                st.warning(f"WeatherAPI error {e.response.status_code}: {detail}")
+            except requests.exceptions.RetryError:
+                st.warning("WeatherAPI error: service unavailable after retries")
+            except requests.RequestException as e:
+                st.warning(f"WeatherAPI error: {type(e).__name__}")
             except Exception as e:
                 st.warning(f"WeatherAPI error: {e}")
         
@@ -146,14 +340,12 @@ class WeatherDataProcessor:
             
         # Simulate ensemble calculation
         base_temp = data.get('weatherapi', {}).get('current', {}).get('temp_c', 20)
-        ensemble_temps = np.random.normal(base_temp, 2, 50)
-        
-        return {
-            'mean': np.mean(ensemble_temps),
-            'std': np.std(ensemble_temps),
-            'percentiles': np.percentile(ensemble_temps, [10, 25, 50, 75, 90]),
-            'confidence': 0.85 + np.random.random() * 0.1
-        }
+        return ensemble_forecast_stats(base_temp)
+
+# Upper edges of the Low/Moderate/High/Very High bands; above the last is Extreme
+RISK_EDGES = np.array([0.2, 0.4, 0.6, 0.8])
+RISK_LEVELS = ('Low', 'Moderate', 'High', 'Very High', 'Extreme')
+RISK_COLORS = ('#2ecc71', '#f39c12', '#e74c3c', '#8e44ad', '#2c3e50')
 
 class CyclonePredictor:
     def __init__(self):
@@ -172,11 +364,25 @@ class CyclonePredictor:
         humidity = current.get('humidity', 50)
         temp = current.get('temp_c', 25)
         
-        # Advanced risk calculation
-        wind_risk = min(wind_speed / 120, 1.0)
-        pressure_risk = max(0, (1013 - pressure) / 50)
-        thermal_risk = max(0, (temp - 26) / 10) if temp > 26 else 0
-        moisture_risk = humidity / 100
+        # Advanced risk calculation, via the batch path with a single reading
+        idx, combined_risk, factors = self.assess_batch(
+            [wind_speed], [pressure], [temp], [humidity]
+        )
+        idx = int(idx[0])
+        
+        return {
+            'risk_level': RISK_LEVELS[idx],
+            'probability': min(float(combined_risk[0]), 1.0),
+            'color': RISK_COLORS[idx],
+            'factors': {name: float(values[0]) for name, values in factors.items()}
+        }
+    
+    def assess_batch(self, wind_speed, pressure, temp, humidity):
+        """Vectorized risk scoring for arrays of readings (e.g. map overlays)"""
+        wind_risk = np.minimum(np.asarray(wind_speed, dtype=float) / 120, 1.0)
+        pressure_risk = np.maximum(0, (1013 - np.asarray(pressure, dtype=float)) / 50)
+        thermal_risk = np.maximum(0, (np.asarray(temp, dtype=float) - 26) / 10)
+        moisture_risk = np.asarray(humidity, dtype=float) / 100
         
         combined_risk = (
             wind_risk * 0.3 + 
@@ -185,47 +391,43 @@ class CyclonePredictor:
             moisture_risk * 0.2
         )
         
-        risk_levels = {
-            (0, 0.2): ('Low', '#2ecc71'),
-            (0.2, 0.4): ('Moderate', '#f39c12'),
-            (0.4, 0.6): ('High', '#e74c3c'),
-            (0.6, 0.8): ('Very High', '#8e44ad'),
-            (0.8, 1.0): ('Extreme', '#2c3e50')
-        }
-        
-        for (low, high), (level, color) in risk_levels.items():
-            if low <= combined_risk < high:
-                return {
-                    'risk_level': level,
-                    'probability': combined_risk,
-                    'color': color,
-                    'factors': {
-                        'wind': wind_risk,
-                        'pressure': pressure_risk,
-                        'thermal': thermal_risk,
-                        'moisture': moisture_risk
-                    }
-                }
+        # Band index 0..4 per reading; anything at or above the last edge is Extreme
+        idx = np.digitize(combined_risk, RISK_EDGES)
         
-        return {'risk_level': 'Extreme', 'probability': 1.0, 'color': '#2c3e50'}
+        factors = {
+            'wind': wind_risk,
+            'pressure': pressure_risk,
+            'thermal': thermal_risk,
+            'moisture': moisture_risk
+        }
+        return idx, combined_risk, factors
 
 class AIInsightEngine:
     def __init__(self, api_key):
         self.api_key = api_key
         self.context_window = 32000
+        self._session = get_http_session()
+        # Process-wide LRU of replies; the engine is shared across sessions via get_ai_engine
+        self._replies = OrderedDict()
+        self._replies_lock = threading.Lock()
+        self.max_cached_replies = 128
     
     def generate_advanced_analysis(self, weather_data, risk_assessment):
         """Generate comprehensive meteorological analysis"""
         if not self.api_key:
             return None
         
+        weatherapi = weather_data.get('weatherapi', {})
+        current = weatherapi.get('current', {})
+        loc = weatherapi.get('location', {})
+        
         context = f"""
         Current Weather Analysis:
-        - Location: {weather_data.get('weatherapi', {}).get('location', {}).get('name', 'Unknown')}
-        - Temperature: {weather_data.get('weatherapi', {}).get('current', {}).get('temp_c', 'N/A')}°C
-        - Wind Speed: {weather_data.get('weatherapi', {}).get('current', {}).get('wind_kph', 'N/A')} kph
-        - Pressure: {weather_data.get('weatherapi', {}).get('current', {}).get('pressure_mb', 'N/A')} mb
-        - Humidity: {weather_data.get('weatherapi', {}).get('current', {}).get('humidity', 'N/A')}%
+        - Location: {loc.get('name', 'Unknown')}
+        - Temperature: {current.get('temp_c', 'N/A')}°C
+        - Wind Speed: {current.get('wind_kph', 'N/A')} kph
+        - Pressure: {current.get('pressure_mb', 'N/A')} mb
+        - Humidity: {current.get('humidity', 'N/A')}%
         - Cyclone Risk Level: {risk_assessment.get('risk_level', 'Unknown')}
         - Risk Probability: {risk_assessment.get('probability', 0):.2%}
         
@@ -241,43 +443,307 @@ class AIInsightEngine:
         return self._query_gemini(context)
     
     def _query_gemini(self, prompt):
-        """Query Gemini with advanced configuration"""
+        """Stream a Gemini reply chunk by chunk as server-sent events arrive"""
+        # Exact-match reply cache; whitespace and case differences hit the same entry
+        reply_cache = st.session_state.setdefault('gemini_cache', {})
+        normalized = " ".join(prompt.split()).lower()
+        cache_key = hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest()
+        if cache_key in reply_cache:
+            yield reply_cache[cache_key]
+            return
+        
+        shared_reply = self._cached_reply(cache_key)
+        if shared_reply:
+            reply_cache[cache_key] = shared_reply
+            yield shared_reply
+            return
+        
         headers = {
             "x-goog-api-key": self.api_key,
             "Content-Type": "application/json"
         }
         
-        data = {
-            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
-            "generationConfig": {
-                "temperature": 0.3,
-                "topP": 0.8,
-                "topK": 40,
-                "maxOutputTokens": 2048
-            },
-            "safetySettings": [
-                {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-                {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
-            ]
-        }
+        body = GEMINI_BODY_PREFIX + json.dumps(prompt).encode() + GEMINI_BODY_SUFFIX
         
         try:
-            response = requests.post(GEMINI_API_URL, headers=headers, json=data, timeout=30)
+            response = self._session.post(
+                GEMINI_STREAM_URL,
+                params={"alt": "sse"},
+                headers=headers,
+                data=body,
+                timeout=30,
+                stream=True
+            )
             response.raise_for_status()
-            result = response.json()
             
-            candidates = result.get('candidates', [])
-            if candidates:
-                content = candidates[0].get('content', {})
-                parts = content.get('parts', [])
-                if parts:
-                    return parts[0].get('text', '')
+            chunks = []
+            for line in response.iter_lines():
+                if not line.startswith(b"data: "):
+                    continue
+                result = json.loads(line[6:])
+                
+                try:
+                    text = result['candidates'][0]['content']['parts'][0]['text']
+                except (KeyError, IndexError, TypeError):
+                    continue
+                if text:
+                    chunks.append(text)
+                    yield text
+            
+            reply = "".join(chunks)
+            if reply:
+                reply_cache[cache_key] = reply
+                self._remember_reply(cache_key, reply)
         except Exception as e:
             st.error(f"AI Analysis Error: {e}")
-        
-        return None
+            # Let the caller know the reply is incomplete
+            raise
+    
+    def _cached_reply(self, cache_key):
+        """Look up a reply in the shared LRU, marking it most recently used"""
+        with self._replies_lock:
+            reply = self._replies.get(cache_key)
+            if reply is not None:
+                self._replies.move_to_end(cache_key)
+            return reply
+    
+    def _remember_reply(self, cache_key, reply):
+        """Store a reply in the shared LRU, evicting the oldest beyond the size limit"""
+        with self._replies_lock:
+            self._replies[cache_key] = reply
+            self._replies.move_to_end(cache_key)
+            while len(self._replies) > self.max_cached_replies:
+                self._replies.popitem(last=False)
+
+# --- Forecast Helpers ---
+@st.cache_data(max_entries=128, show_spinner=False)
+def ensemble_forecast_stats(base_temp):
+    """Simulated ensemble statistics, memoized per base temperature"""
+    ensemble_temps = RNG.normal(base_temp, 2, 50)
+    ensemble_temps.sort()
+    n = ensemble_temps.size
+    
+    mean = ensemble_temps.mean()
+    var = ensemble_temps.dot(ensemble_temps) / n - mean * mean
+    
+    # Linearly interpolated 10/25/50/75/90th percentiles read off the sorted sample
+    pos = np.array([0.10, 0.25, 0.50, 0.75, 0.90]) * (n - 1)
+    lo = pos.astype(int)
+    hi = np.minimum(lo + 1, n - 1)
+    percentiles = ensemble_temps[lo] + (ensemble_temps[hi] - ensemble_temps[lo]) * (pos - lo)
+    
+    return {
+        'mean': mean,
+        'std': np.sqrt(max(var, 0.0)),
+        'percentiles': percentiles,
+        'confidence': 0.85 + RNG.random() * 0.1
+    }
+
+def build_ensemble_members(mean, hours, n_members=10):
+    """Ensemble temperature members as rows of one (n_members, len(hours)) array"""
+    base_trend = mean + np.sin(hours * 2 * np.pi / 24) * 5  # Diurnal cycle, computed once
+    members = RNG.normal(0, 2, (n_members, hours.size))
+    members += base_trend  # Broadcast across every member in place
+    return members
+
+# --- Simulated Datasets ---
+@st.cache_data
+def historical_risk_df():
+    """Daily simulated cyclone risk for 2024"""
+    dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='D')
+    return pd.DataFrame({
+        'Date': dates,
+        'Risk': RNG.beta(2, 5, len(dates))
+    })
+
+@st.cache_data
+def climate_anomaly_df():
+    """Monthly simulated temperature anomaly, 2020-2024"""
+    dates = pd.date_range(start='2020-01-01', end='2024-12-31', freq='ME')
+    temp_anomaly = RNG.normal(0, 1.5, len(dates))
+    temp_anomaly += np.sin(np.arange(len(dates)) * 2 * np.pi / 12) * 0.5  # Seasonal cycle
+    
+    return pd.DataFrame({
+        'Date': dates,
+        'Temperature Anomaly': temp_anomaly
+    })
+
+@st.cache_data
+def extreme_events_df():
+    """Simulated yearly counts of extreme events, 2015-2024"""
+    years = np.arange(2015, 2025)
+    return pd.DataFrame({
+        'Year': years,
+        'Hurricanes': RNG.poisson(8, len(years)),
+        'Typhoons': RNG.poisson(12, len(years)),
+        'Cyclones': RNG.poisson(15, len(years))
+    })
+
+@st.cache_data(ttl=3600)
+def correlation_sample_df(base_temp, n_samples=1000, seed=42):
+    """Synthetic correlated weather variables centred on the current temperature"""
+    corr_rng = np.random.default_rng(seed)
+    
+    # Create correlated variables: each column is a linear function of temperature
+    # plus its own noise. The loading matrix is lower-triangular, i.e. already the
+    # Cholesky factor of the covariance, so one matmul replaces multivariate_normal's SVD
+    corr_mean = np.array([base_temp, 100 - base_temp * 1.5, 1013 - base_temp * 0.5, base_temp * 0.3, base_temp * 0.2])
+    loadings = np.array([
+        [5.0, 0, 0, 0, 0],     # Temperature
+        [-7.5, 10, 0, 0, 0],   # Humidity = 100 - 1.5 * temp + N(0, 10)
+        [-2.5, 0, 5, 0, 0],    # Pressure = 1013 - 0.5 * temp + N(0, 5)
+        [1.5, 0, 0, 3, 0],     # Wind Speed = 0.3 * temp + N(0, 3)
+        [1.0, 0, 0, 0, 1]      # UV Index = 0.2 * temp + N(0, 1)
+    ])
+    samples = loadings @ corr_rng.standard_normal((5, n_samples))
+    samples += corr_mean[:, None]
+    
+    np.clip(samples[1], 0, 100, out=samples[1])
+    np.maximum(samples[3], 0, out=samples[3])
+    np.clip(samples[4], 0, 12, out=samples[4])
+    
+    return pd.DataFrame(samples.T, columns=['Temperature', 'Humidity', 'Pressure', 'Wind Speed', 'UV Index'])
+
+@st.cache_data(ttl=3600)
+def correlation_stats(base_temp, n_samples=1000, seed=42):
+    """Correlation matrix and describe()-style summary of the synthetic sample, straight from NumPy"""
+    df_corr = correlation_sample_df(base_temp, n_samples, seed)
+    mat = df_corr.to_numpy()
+    
+    corr_matrix = pd.DataFrame(np.corrcoef(mat, rowvar=False), index=df_corr.columns, columns=df_corr.columns)
+    summary = pd.DataFrame(
+        np.vstack([
+            np.full(mat.shape[1], mat.shape[0]),
+            mat.mean(axis=0),
+            mat.std(axis=0, ddof=1),
+            mat.min(axis=0),
+            np.percentile(mat, [25, 50, 75], axis=0),
+            mat.max(axis=0)
+        ]),
+        index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+        columns=df_corr.columns
+    )
+    return corr_matrix, summary
+
+@st.cache_data(ttl=3600)
+def climate_trend_data():
+    """Simulated yearly temperature, sea level and CO2 series, 1980-2024"""
+    years_trend = np.arange(1980, 2025)
+    
+    # Global temperature trend with noise
+    temp_trend = 14.0 + 0.02 * (years_trend - 1980) + RNG.normal(0, 0.3, len(years_trend))
+    
+    # Sea level trend
+    sea_level_trend = 0 + 3.2 * (years_trend - 1980) / 1000 + RNG.normal(0, 0.01, len(years_trend))
+    
+    # CO2 levels
+    co2_trend = 340 + 2.0 * (years_trend - 1980) + RNG.normal(0, 2, len(years_trend))
+    
+    return years_trend, temp_trend, sea_level_trend, co2_trend
+
+@st.cache_data(ttl=3600)
+def distribution_samples(temp_c, n_samples=2000):
+    """Temperature, precipitation and wind speed samples for the distribution plots"""
+    # 2k float32 samples are plenty for a 50-bin histogram and halve the chart payload
+    # Temperature distribution
+    temp_dist = RNG.normal(temp_c, 8, n_samples).astype(np.float32)
+    
+    # Precipitation distribution (log-normal)
+    precip_dist = RNG.lognormal(1, 1, n_samples).astype(np.float32)
+    
+    # Wind speed distribution (Weibull)
+    wind_dist = (RNG.weibull(2, n_samples) * 20).astype(np.float32)
+    
+    return temp_dist, precip_dist, wind_dist
+
+@st.cache_resource
+def quality_trend_df():
+    """Simulated monthly data quality score for 2024; fixed, so built once per process"""
+    return pd.DataFrame({
+        'Month': pd.date_range('2024-01-01', periods=12, freq='ME'),
+        'Quality Score': np.random.default_rng(0).normal(96, 2, 12)
+    })
+
+@st.cache_resource
+def validation_metrics_df():
+    """Fixed model validation scores, built once from a float32 record array"""
+    records = np.array(
+        [
+            ('Neural Network', 1.2, 1.8, 0.92, 0.88),
+            ('Random Forest', 1.5, 2.1, 0.89, 0.85),
+            ('SVM', 1.8, 2.5, 0.85, 0.82),
+            ('XGBoost', 1.3, 1.9, 0.91, 0.87),
+            ('Ensemble', 1.0, 1.5, 0.95, 0.92)
+        ],
+        dtype=[('Model', 'U16'), ('MAE', 'f4'), ('RMSE', 'f4'), ('R²', 'f4'), ('Validation Score', 'f4')]
+    )
+    return pd.DataFrame.from_records(records)
+
+@st.cache_data(ttl=3600)
+def response_time_series():
+    """Simulated API response time for each hour of the day"""
+    hours = np.arange(24)
+    return hours, RNG.gamma(2, 50, 24)
+
+def distribution_moments(samples):
+    """Mean, std, skewness and excess kurtosis per column, from one set of central moments"""
+    samples = np.asarray(samples, dtype=np.float64)
+    n = samples.shape[0]
+    mean = samples.mean(axis=0)
+    d = samples - mean
+    d2 = d * d
+    m2 = d2.mean(axis=0)
+    m3 = (d2 * d).mean(axis=0)
+    m4 = (d2 * d2).mean(axis=0)
+    
+    # Bias-corrected like pandas' Series.skew() / Series.kurtosis()
+    g1 = m3 / m2 ** 1.5
+    g2 = m4 / m2 ** 2 - 3
+    skew = g1 * np.sqrt(n * (n - 1)) / (n - 2)
+    kurt = ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3))
+    return np.column_stack([mean, np.sqrt(m2), skew, kurt])
+
+# Upper bound on points sent to the browser per line trace
+MAX_CHART_POINTS = 1000
+
+def lttb_indices(y, n_out=MAX_CHART_POINTS, x=None):
+    """Indices of a Largest-Triangle-Three-Buckets downsample; every index if already small"""
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    y = np.asarray(y, dtype=float)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+    
+    # First and last points are kept; interior points are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=int)
+    idx[0], idx[-1] = 0, n - 1
+    
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        next_hi = edges[b + 2] if b + 2 < n_out - 1 else n
+        avg_x, avg_y = x[hi:next_hi].mean(), y[hi:next_hi].mean()
+        
+        # Keep the point forming the largest triangle with the previous pick and the next bucket's mean
+        area = np.abs(
+            (x[prev] - avg_x) * (y[lo:hi] - y[prev]) - (x[prev] - x[lo:hi]) * (avg_y - y[prev])
+        )
+        prev = lo + int(area.argmax())
+        idx[b + 1] = prev
+    
+    return idx
+
+def histogram_bar(a, name, bins=50):
+    """Bar trace of a histogram binned server-side, so only the bin counts reach the browser"""
+    counts, edges = np.histogram(a, bins=bins)
+    return go.Bar(
+        x=0.5 * (edges[:-1] + edges[1:]),
+        y=counts,
+        width=np.diff(edges),
+        name=name
+    )
 
 # --- Initialize Classes ---
 @st.cache_resource
@@ -286,6 +752,81 @@ def get_processors():
 
 processor, cyclone_predictor = get_processors()
 
+@st.cache_resource
+def get_ai_engine(api_key):
+    return AIInsightEngine(api_key)
+
+# --- AI Insights Panel ---
+@st.fragment
+def ai_insights_panel(gemini_api_key, weather_data, risk_assessment):
+    """Render the AI analysis controls; reruns in isolation on its own widgets"""
+    ai_engine = get_ai_engine(gemini_api_key)
+    
+    selected_analysis = st.selectbox("Select Analysis Type", AI_ANALYSIS_OPTIONS)
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        custom_query = st.text_area(
+            "Custom Analysis Query",
+            placeholder="Ask specific questions about weather patterns, climate impacts, or forecasting...",
+            height=100
+        )
+    
+    with col2:
+        st.markdown("### AI Model Info")
+        st.info("**Model:** Gemini 2.0 Flash")
+        st.info("**Context:** 32K tokens")
+        st.info("**Specialization:** Meteorology")
+    
+    # Last report survives reruns triggered by the panel's other widgets, but only
+    # while the weather snapshot and query that produced it are still current
+    loc = weather_data.get('weatherapi', {}).get('location', {})
+    report_key = (loc.get('name'), loc.get('localtime'), custom_query)
+    report_key_saved, report = st.session_state.get('ai_report') or (None, None)
+    if report_key_saved != report_key:
+        report = st.session_state.ai_report = None
+    
+    if st.button("🧠 Generate AI Analysis", type="primary"):
+        if weather_data:
+            if custom_query:
+                stream = ai_engine._query_gemini(custom_query)
+            else:
+                stream = ai_engine.generate_advanced_analysis(weather_data, risk_assessment)
+            
+            st.markdown("### 🎯 AI Weather Intelligence Report")
+            with st.spinner("AI is analyzing weather data..."):
+                try:
+                    analysis = st.write_stream(stream) if stream else None
+                except Exception:
+                    # Stream broke off; the error is already shown and the partial text is not kept
+                    analysis = None
+                else:
+                    if not analysis:
+                        st.error("Failed to generate AI analysis. Please check your API key.")
+            
+            report = analysis
+            st.session_state.ai_report = (report_key, analysis) if analysis else None
+        else:
+            report = st.session_state.ai_report = None
+            st.warning("Please fetch weather data first in the Real-Time Analysis tab.")
+    elif report:
+        st.markdown("### 🎯 AI Weather Intelligence Report")
+        st.markdown(report)
+    
+    if report:
+        # Generate additional insights
+        st.markdown("### 📊 Key Insights")
+        
+        insights = [
+            "Atmospheric pressure trends indicate potential system development",
+            "Wind shear analysis suggests favorable conditions for intensification",
+            "Sea surface temperature anomalies detected in the region",
+            "Upper-level divergence patterns support convective development"
+        ]
+        
+        st.markdown("\n".join(f"- {insight}" for insight in insights))
+
 # Initialize data variables globally to prevent NameError
 weather_data = {}
 risk_assessment = {}
@@ -313,15 +854,13 @@ with tab1:
             help="Enter city name, coordinates, or airport code"
         )
         
-        analysis_type = st.selectbox(
-            "Analysis Type",
-            ["Standard", "Detailed", "Research Grade", "Emergency Response"]
-        )
+        analysis_type = st.selectbox("Analysis Type", ANALYSIS_TYPES)
     
     with col2:
         st.markdown("### Quick Actions")
         if st.button("🔄 Refresh Data", type="primary"):
             st.cache_data.clear()
+            get_http_session().cache.clear()
         if st.button("📊 Generate Report"):
             st.info("Report generation initiated...")
     
@@ -329,32 +868,19 @@ with tab1:
         api_keys = {'weatherapi': weatherapi_key, 'openweather': openweather_key}
         
         with st.spinner("Fetching multi-source weather data..."):
-            weather_data = processor.fetch_multi_source_data(location, api_keys)
+            weather_data = processor.fetch_multi_source_data(location, api_keys, update_interval)
             risk_assessment = cyclone_predictor.assess_cyclone_risk(weather_data)
             ensemble_forecast = processor.calculate_ensemble_forecast(weather_data)
         
         if weather_data:
-            current = weather_data.get('weatherapi', {}).get('current', {})
-            location_data = weather_data.get('weatherapi', {}).get('location', {})
+            weatherapi = weather_data.get('weatherapi', {})
+            current = weatherapi.get('current', {})
+            location_data = weatherapi.get('location', {})
             
-            # Alert System
-            if risk_assessment['probability'] > 0.7:
-                st.markdown(f"""
-                <div class="alert-critical">
-                    <h3>🚨 CRITICAL WEATHER ALERT</h3>
-                    <p><strong>Risk Level:</strong> {risk_assessment['risk_level']}</p>
-                    <p><strong>Probability:</strong> {risk_assessment['probability']:.1%}</p>
-                    <p><strong>Immediate Action Required</strong></p>
-                </div>
-                """, unsafe_allow_html=True)
-            elif risk_assessment['probability'] > 0.4:
-                st.markdown(f"""
-                <div class="alert-warning">
-                    <h3>⚠️ Weather Warning</h3>
-                    <p><strong>Risk Level:</strong> {risk_assessment['risk_level']}</p>
-                    <p><strong>Probability:</strong> {risk_assessment['probability']:.1%}</p>
-                </div>
-                """, unsafe_allow_html=True)
+            # Alert System: tier 0 (no banner), 1 (warning) or 2 (critical)
+            alert_tier = int(np.searchsorted(ALERT_EDGES, risk_assessment['probability'], side='left'))
+            if ALERT_TEMPLATES[alert_tier]:
+                st.markdown(ALERT_TEMPLATES[alert_tier].format(**risk_assessment), unsafe_allow_html=True)
             
             # Current Conditions Dashboard
             st.subheader(f"📍 {location_data.get('name', location)}, {location_data.get('country', '')}")
@@ -467,13 +993,7 @@ with tab2:
             st.subheader("Historical Context")
             
             # Simulate historical data
-            dates = pd.date_range(start='2024-01-01', end='2024-12-31', freq='D')
-            historical_risk = np.random.beta(2, 5, len(dates))
-            
-            df_hist = pd.DataFrame({
-                'Date': dates,
-                'Risk': historical_risk
-            })
+            df_hist = historical_risk_df()
             
             fig_hist = px.line(
                 df_hist, 
@@ -500,27 +1020,24 @@ with tab3:
         hours = np.arange(0, 168, 3)  # 7 days, 3-hour intervals
         
         # Generate ensemble members
-        ensemble_members = []
-        for i in range(10):
-            base_trend = np.sin(hours * 2 * np.pi / 24) * 5  # Diurnal cycle
-            noise = np.random.normal(0, 2, len(hours))
-            member = ensemble_forecast['mean'] + base_trend + noise
-            ensemble_members.append(member)
+        ensemble_members = build_ensemble_members(ensemble_forecast['mean'], hours)
         
         # Create subplot
         fig_ensemble = go.Figure()
         
-        # Add individual ensemble members
-        for i, member in enumerate(ensemble_members):
-            fig_ensemble.add_trace(go.Scatter(
-                x=hours,
-                y=member,
-                mode='lines',
-                name=f'Member {i+1}',
-                opacity=0.3,
-                showlegend=False,
-                line=dict(color='lightblue', width=1)
-            ))
+        # Add individual ensemble members as one WebGL trace, NaN-separated per member
+        n_members = ensemble_members.shape[0]
+        member_x = np.tile(np.append(hours, np.nan), n_members)
+        member_y = np.column_stack([ensemble_members, np.full(n_members, np.nan)]).ravel()
+        fig_ensemble.add_trace(go.Scattergl(
+            x=member_x,
+            y=member_y,
+            mode='lines',
+            name='Members',
+            opacity=0.3,
+            showlegend=False,
+            line=dict(color='lightblue', width=1)
+        ))
         
         # Add ensemble mean
         ensemble_mean = np.mean(ensemble_members, axis=0)
@@ -532,8 +1049,10 @@ with tab3:
             line=dict(color='red', width=3)
         ))
         
-        # Add uncertainty bands
-        ensemble_std = np.std(ensemble_members, axis=0)
+        # Add uncertainty bands; reuse the mean rather than letting np.std recompute it
+        ensemble_std = np.sqrt(np.maximum(
+            (ensemble_members * ensemble_members).mean(axis=0) - ensemble_mean * ensemble_mean, 0
+        ))
         fig_ensemble.add_trace(go.Scatter(
             x=hours,
             y=ensemble_mean + 2*ensemble_std,
@@ -604,6 +1123,10 @@ with tab4:
         lon = location_data.get('lon', 0)
         
         if lat and lon:
+            # Mapping libraries are only loaded once someone actually gets a map
+            import folium
+            from streamlit_folium import st_folium
+            
             # Create base map
             m = folium.Map(location=[lat, lon], zoom_start=8)
             
@@ -619,19 +1142,32 @@ with tab4:
                 icon=folium.Icon(color='red' if risk_assessment['probability'] > 0.5 else 'green')
             ).add_to(m)
             
-            # Add weather overlay (simulated)
-            for i in range(20):
-                rand_lat = lat + np.random.normal(0, 0.5)
-                rand_lon = lon + np.random.normal(0, 0.5)
-                temp_var = np.random.normal(current.get('temp_c', 20), 3)
-                
-                folium.CircleMarker(
-                    [rand_lat, rand_lon],
-                    radius=5,
-                    popup=f"Temperature: {temp_var:.1f}°C",
-                    color='red' if temp_var > 25 else 'blue',
-                    fillOpacity=0.6
-                ).add_to(m)
+            # Add weather overlay (simulated) as one GeoJSON layer instead of a marker per point
+            n_points = 20
+            offsets = RNG.normal(0, 0.5, (n_points, 2))
+            temps = RNG.normal(current.get('temp_c', 20), 3, n_points)
+            
+            overlay = {
+                "type": "FeatureCollection",
+                "features": [
+                    {
+                        "type": "Feature",
+                        "geometry": {"type": "Point", "coordinates": [lon + d_lon, lat + d_lat]},
+                        "properties": {
+                            "popup": f"Temperature: {temp_var:.1f}°C",
+                            "color": 'red' if temp_var > 25 else 'blue'
+                        }
+                    }
+                    for (d_lat, d_lon), temp_var in zip(offsets.tolist(), temps.tolist())
+                ]
+            }
+            
+            folium.GeoJson(
+                overlay,
+                marker=folium.CircleMarker(radius=5, fillOpacity=0.6),
+                style_function=lambda feature: {'color': feature['properties']['color']},
+                popup=folium.GeoJsonPopup(fields=['popup'], labels=False)
+            ).add_to(m)
             
             # Display map
             map_data = st_folium(m, width=700, height=500)
@@ -657,64 +1193,7 @@ with tab5:
     st.header("🤖 Advanced AI Weather Intelligence")
     
     if gemini_api_key:
-        ai_engine = AIInsightEngine(gemini_api_key)
-        
-        # AI Analysis Types
-        analysis_options = [
-            "Comprehensive Weather Analysis",
-            "Cyclone Risk Assessment",
-            "Climate Pattern Analysis",
-            "Agricultural Impact Assessment",
-            "Aviation Weather Briefing",
-            "Marine Weather Analysis",
-            "Emergency Response Planning"
-        ]
-        
-        selected_analysis = st.selectbox("Select Analysis Type", analysis_options)
-        
-        col1, col2 = st.columns([3, 1])
-        
-        with col1:
-            custom_query = st.text_area(
-                "Custom Analysis Query",
-                placeholder="Ask specific questions about weather patterns, climate impacts, or forecasting...",
-                height=100
-            )
-        
-        with col2:
-            st.markdown("### AI Model Info")
-            st.info("**Model:** Gemini 2.0 Flash")
-            st.info("**Context:** 32K tokens")
-            st.info("**Specialization:** Meteorology")
-        
-        if st.button("🧠 Generate AI Analysis", type="primary"):
-            if weather_data:
-                with st.spinner("AI is analyzing weather data..."):
-                    if custom_query:
-                        analysis = ai_engine._query_gemini(custom_query)
-                    else:
-                        analysis = ai_engine.generate_advanced_analysis(weather_data, risk_assessment)
-                    
-                    if analysis:
-                        st.markdown("### 🎯 AI Weather Intelligence Report")
-                        st.markdown(analysis)
-                        
-                        # Generate additional insights
-                        st.markdown("### 📊 Key Insights")
-                        
-                        insights = [
-                            "Atmospheric pressure trends indicate potential system development",
-                            "Wind shear analysis suggests favorable conditions for intensification",
-                            "Sea surface temperature anomalies detected in the region",
-                            "Upper-level divergence patterns support convective development"
-                        ]
-                        
-                        for insight in insights:
-                            st.markdown(f"• {insight}")
-                    else:
-                        st.error("Failed to generate AI analysis. Please check your API key.")
-            else:
-                st.warning("Please fetch weather data first in the Real-Time Analysis tab.")
+        ai_insights_panel(gemini_api_key, weather_data, risk_assessment)
     else:
         st.warning("Please enter your Gemini API key to enable AI analysis.")
 
@@ -728,14 +1207,7 @@ with tab6:
         st.subheader("Climate Anomaly Detection")
         
         # Generate sample climate data
-        dates = pd.date_range(start='2020-01-01', end='2024-12-31', freq='M')
-        temp_anomaly = np.random.normal(0, 1.5, len(dates))
-        temp_anomaly += np.sin(np.arange(len(dates)) * 2 * np.pi / 12) * 0.5  # Seasonal cycle
-        
-        df_anomaly = pd.DataFrame({
-            'Date': dates,
-            'Temperature Anomaly': temp_anomaly
-        })
+        df_anomaly = climate_anomaly_df()
         
         fig_anomaly = px.line(
             df_anomaly,
@@ -753,36 +1225,26 @@ with tab6:
         st.subheader("Extreme Event Frequency")
         
         # Generate extreme event data
-        years = np.arange(2015, 2025)
-        hurricanes = np.random.poisson(8, len(years))
-        typhoons = np.random.poisson(12, len(years))
-        cyclones = np.random.poisson(15, len(years))
-        
-        df_events = pd.DataFrame({
-            'Year': years,
-            'Hurricanes': hurricanes,
-            'Typhoons': typhoons,
-            'Cyclones': cyclones
-        })
+        df_events = extreme_events_df()
         
         fig_events = go.Figure()
         
         fig_events.add_trace(go.Scatter(
-            x=years, y=hurricanes,
+            x=df_events['Year'], y=df_events['Hurricanes'],
             mode='lines+markers',
             name='Hurricanes',
             line=dict(color='red', width=3)
         ))
         
         fig_events.add_trace(go.Scatter(
-            x=years, y=typhoons,
+            x=df_events['Year'], y=df_events['Typhoons'],
             mode='lines+markers',
             name='Typhoons',
             line=dict(color='blue', width=3)
         ))
         
         fig_events.add_trace(go.Scatter(
-            x=years, y=cyclones,
+            x=df_events['Year'], y=df_events['Cyclones'],
             mode='lines+markers',
             name='Cyclones',
             line=dict(color='green', width=3)
@@ -814,27 +1276,9 @@ with tab6:
                 'UV Index': current.get('uv', 5)
             }
             
-            # Generate synthetic correlation data for demonstration
-            np.random.seed(42)
-            n_samples = 1000
-            
-            # Create correlated variables
-            temp_base = np.random.normal(weather_vars['Temperature'], 5, n_samples)
-            humidity_corr = 100 - temp_base * 1.5 + np.random.normal(0, 10, n_samples)
-            pressure_corr = 1013 - temp_base * 0.5 + np.random.normal(0, 5, n_samples)
-            wind_corr = temp_base * 0.3 + np.random.normal(0, 3, n_samples)
-            uv_corr = np.maximum(0, temp_base * 0.2 + np.random.normal(0, 1, n_samples))
-            
-            df_corr = pd.DataFrame({
-                'Temperature': temp_base,
-                'Humidity': np.clip(humidity_corr, 0, 100),
-                'Pressure': pressure_corr,
-                'Wind Speed': np.maximum(0, wind_corr),
-                'UV Index': np.clip(uv_corr, 0, 12)
-            })
-            
-            # Calculate correlation matrix
-            corr_matrix = df_corr.corr()
+            # Generate synthetic correlation data for demonstration, with its
+            # correlation matrix and summary statistics
+            corr_matrix, corr_summary = correlation_stats(weather_vars['Temperature'])
             
             # Create heatmap
             fig_corr = px.imshow(
@@ -848,22 +1292,13 @@ with tab6:
             
             # Statistical summary
             st.subheader("Statistical Summary")
-            st.dataframe(df_corr.describe(), use_container_width=True)
+            st.dataframe(corr_summary, use_container_width=True)
     
     with tab_stat2:
         st.subheader("Long-term Climate Trends")
         
         # Generate trend data
-        years_trend = np.arange(1980, 2025)
-        
-        # Global temperature trend with noise
-        temp_trend = 14.0 + 0.02 * (years_trend - 1980) + np.random.normal(0, 0.3, len(years_trend))
-        
-        # Sea level trend
-        sea_level_trend = 0 + 3.2 * (years_trend - 1980) / 1000 + np.random.normal(0, 0.01, len(years_trend))
-        
-        # CO2 levels
-        co2_trend = 340 + 2.0 * (years_trend - 1980) + np.random.normal(0, 2, len(years_trend))
+        years_trend, temp_trend, sea_level_trend, co2_trend = climate_trend_data()
         
         # Create subplots
         fig_trends = make_subplots(
@@ -872,20 +1307,15 @@ with tab6:
             vertical_spacing=0.08
         )
         
-        fig_trends.add_trace(
-            go.Scatter(x=years_trend, y=temp_trend, mode='lines', name='Temperature'),
-            row=1, col=1
-        )
-        
-        fig_trends.add_trace(
-            go.Scatter(x=years_trend, y=sea_level_trend, mode='lines', name='Sea Level'),
-            row=2, col=1
-        )
-        
-        fig_trends.add_trace(
-            go.Scatter(x=years_trend, y=co2_trend, mode='lines', name='CO2'),
-            row=3, col=1
-        )
+        # Each trace is capped at MAX_CHART_POINTS so the payload stays bounded as the series grow
+        for row, (series, name) in enumerate(
+            [(temp_trend, 'Temperature'), (sea_level_trend, 'Sea Level'), (co2_trend, 'CO2')], start=1
+        ):
+            shown = lttb_indices(series, x=years_trend)
+            fig_trends.add_trace(
+                go.Scattergl(x=years_trend[shown], y=series[shown], mode='lines', name=name),
+                row=row, col=1
+            )
         
         fig_trends.update_layout(height=600, title_text="Climate Trend Analysis (1980-2024)")
         fig_trends.update_xaxes(title_text="Year")
@@ -895,19 +1325,21 @@ with tab6:
         
         st.plotly_chart(fig_trends, use_container_width=True)
         
-        # Trend analysis results
+        # Trend analysis results: one least-squares solve fits all three series
+        design = np.column_stack([years_trend, np.ones_like(years_trend)])
+        series = np.column_stack([temp_trend, sea_level_trend, co2_trend])
+        temp_slope, sea_slope, co2_slope = np.linalg.lstsq(design, series, rcond=None)[0][0]
+        sea_slope *= 1000
+        
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            temp_slope = np.polyfit(years_trend, temp_trend, 1)[0]
             st.metric("Temperature Trend", f"{temp_slope:.3f}°C/year", delta="Warming")
         
         with col2:
-            sea_slope = np.polyfit(years_trend, sea_level_trend, 1)[0] * 1000
             st.metric("Sea Level Trend", f"{sea_slope:.2f}mm/year", delta="Rising")
         
         with col3:
-            co2_slope = np.polyfit(years_trend, co2_trend, 1)[0]
             st.metric("CO2 Trend", f"{co2_slope:.2f}ppm/year", delta="Increasing")
     
     with tab_stat3:
@@ -916,74 +1348,50 @@ with tab6:
         if weather_data:
             # Generate distribution data based on current conditions
             current = weather_data.get('weatherapi', {}).get('current', {})
+            temp_c = current.get('temp_c', 20)
+            wind_kph = current.get('wind_kph', 10)
             
-            # Temperature distribution
-            temp_dist = np.random.normal(current.get('temp_c', 20), 8, 10000)
-            
-            # Precipitation distribution (log-normal)
-            precip_dist = np.random.lognormal(1, 1, 10000)
+            temp_dist, precip_dist, wind_dist = distribution_samples(temp_c)
             
-            # Wind speed distribution (Weibull)
-            wind_dist = np.random.weibull(2, 10000) * 20
+            fig_dist = make_subplots(
+                rows=2, cols=2,
+                specs=[[{}, {}], [{}, None]],
+                subplot_titles=("Temperature Distribution", "Precipitation Distribution", "Wind Speed Distribution")
+            )
+            fig_dist.add_trace(histogram_bar(temp_dist, 'Temperature'), row=1, col=1)
+            fig_dist.add_trace(histogram_bar(precip_dist, 'Precipitation'), row=1, col=2)
+            fig_dist.add_trace(histogram_bar(wind_dist, 'Wind Speed'), row=2, col=1)
             
-            col1, col2 = st.columns(2)
+            fig_dist.add_vline(
+                x=temp_c,
+                line_dash="dash",
+                line_color="red",
+                annotation_text="Current",
+                row=1, col=1
+            )
+            fig_dist.add_vline(
+                x=wind_kph,
+                line_dash="dash",
+                line_color="red",
+                annotation_text="Current",
+                row=2, col=1
+            )
             
-            with col1:
-                fig_temp_dist = px.histogram(
-                    x=temp_dist,
-                    nbins=50,
-                    title="Temperature Distribution",
-                    labels={'x': 'Temperature (°C)', 'y': 'Frequency'}
-                )
-                fig_temp_dist.add_vline(
-                    x=current.get('temp_c', 20),
-                    line_dash="dash",
-                    line_color="red",
-                    annotation_text="Current"
-                )
-                st.plotly_chart(fig_temp_dist, use_container_width=True)
-                
-                fig_precip_dist = px.histogram(
-                    x=precip_dist,
-                    nbins=50,
-                    title="Precipitation Distribution",
-                    labels={'x': 'Precipitation (mm)', 'y': 'Frequency'}
-                )
-                st.plotly_chart(fig_precip_dist, use_container_width=True)
+            fig_dist.update_xaxes(title_text='Temperature (°C)', row=1, col=1)
+            fig_dist.update_xaxes(title_text='Precipitation (mm)', row=1, col=2)
+            fig_dist.update_xaxes(title_text='Wind Speed (km/h)', row=2, col=1)
+            fig_dist.update_yaxes(title_text='Frequency')
+            fig_dist.update_layout(height=700, showlegend=False, bargap=0)
+            st.plotly_chart(fig_dist, use_container_width=True)
             
-            with col2:
-                fig_wind_dist = px.histogram(
-                    x=wind_dist,
-                    nbins=50,
-                    title="Wind Speed Distribution",
-                    labels={'x': 'Wind Speed (km/h)', 'y': 'Frequency'}
-                )
-                fig_wind_dist.add_vline(
-                    x=current.get('wind_kph', 10),
-                    line_dash="dash",
-                    line_color="red",
-                    annotation_text="Current"
-                )
-                st.plotly_chart(fig_wind_dist, use_container_width=True)
-                
-                # Statistical tests
-                st.subheader("Distribution Statistics")
-                stats_data = pd.DataFrame({
-                    'Variable': ['Temperature', 'Precipitation', 'Wind Speed'],
-                    'Mean': [np.mean(temp_dist), np.mean(precip_dist), np.mean(wind_dist)],
-                    'Std Dev': [np.std(temp_dist), np.std(precip_dist), np.std(wind_dist)],
-                    'Skewness': [
-                        float(pd.Series(temp_dist).skew()),
-                        float(pd.Series(precip_dist).skew()),
-                        float(pd.Series(wind_dist).skew())
-                    ],
-                    'Kurtosis': [
-                        float(pd.Series(temp_dist).kurtosis()),
-                        float(pd.Series(precip_dist).kurtosis()),
-                        float(pd.Series(wind_dist).kurtosis())
-                    ]
-                })
-                st.dataframe(stats_data, use_container_width=True)
+            # Statistical tests
+            st.subheader("Distribution Statistics")
+            stats_data = pd.DataFrame(
+                distribution_moments(np.column_stack([temp_dist, precip_dist, wind_dist])),
+                columns=['Mean', 'Std Dev', 'Skewness', 'Kurtosis']
+            )
+            stats_data.insert(0, 'Variable', ['Temperature', 'Precipitation', 'Wind Speed'])
+            st.dataframe(stats_data, use_container_width=True)
 
 # --- Advanced Research Tools ---
 st.markdown("---")
@@ -995,13 +1403,7 @@ with research_col1:
     st.subheader("🧪 Model Validation")
     
     with st.expander("Cross-Validation Results"):
-        validation_metrics = pd.DataFrame({
-            'Model': ['Neural Network', 'Random Forest', 'SVM', 'XGBoost', 'Ensemble'],
-            'MAE': [1.2, 1.5, 1.8, 1.3, 1.0],
-            'RMSE': [1.8, 2.1, 2.5, 1.9, 1.5],
-            'R²': [0.92, 0.89, 0.85, 0.91, 0.95],
-            'Validation Score': [0.88, 0.85, 0.82, 0.87, 0.92]
-        })
+        validation_metrics = validation_metrics_df()
         
         st.dataframe(validation_metrics, use_container_width=True)
         
@@ -1026,20 +1428,27 @@ with research_col2:
             'Validity': 97.3
         }
         
-        for metric, value in quality_metrics.items():
-            st.metric(metric, f"{value}%", delta=f"{value-95:.1f}%" if value > 95 else f"{value-95:.1f}%")
+        quality_table = pd.DataFrame(quality_metrics.items(), columns=['Metric', 'Value'])
+        quality_table['Delta'] = quality_table['Value'] - 95
+        st.dataframe(
+            quality_table,
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'Value': st.column_config.NumberColumn(format="%.1f%%"),
+                'Delta': st.column_config.NumberColumn(format="%+.1f%%")
+            }
+        )
         
         # Quality trend
-        quality_trend = pd.DataFrame({
-            'Month': pd.date_range('2024-01-01', periods=12, freq='M'),
-            'Quality Score': np.random.normal(96, 2, 12)
-        })
+        quality_trend = quality_trend_df()
         
         fig_quality = px.line(
-            quality_trend,
+            quality_trend.iloc[lttb_indices(quality_trend['Quality Score'].to_numpy())],
             x='Month',
             y='Quality Score',
-            title='Data Quality Trend'
+            title='Data Quality Trend',
+            render_mode='webgl'
         )
         st.plotly_chart(fig_quality, use_container_width=True)
 
@@ -1055,18 +1464,23 @@ with research_col3:
             'Uptime': '99.97%'
         }
         
-        for metric, value in perf_metrics.items():
-            st.text(f"{metric}: {value}")
+        st.dataframe(
+            pd.DataFrame(perf_metrics.items(), columns=['Metric', 'Value']),
+            hide_index=True,
+            use_container_width=True
+        )
         
         # Performance monitoring
-        hours = np.arange(24)
-        response_times = np.random.gamma(2, 50, 24)  # Simulate response times
+        hours, response_times = response_time_series()
+        shown = lttb_indices(response_times, x=hours)
+        hours, response_times = hours[shown], response_times[shown]
         
         fig_perf = px.line(
             x=hours,
             y=response_times,
             title='24-Hour Response Time Monitoring',
-            labels={'x': 'Hour of Day', 'y': 'Response Time (ms)'}
+            labels={'x': 'Hour of Day', 'y': 'Response Time (ms)'},
+            render_mode='webgl'
         )
         st.plotly_chart(fig_perf, use_container_width=True)
 
@@ -1074,93 +1488,85 @@ with research_col3:
 st.markdown("---")
 st.header("📊 Export & Reporting")
 
-export_col1, export_col2, export_col3, export_col4 = st.columns(4)
-
-with export_col1:
-    if st.button("📄 Generate PDF Report", type="primary"):
-        st.success("PDF report generation initiated...")
-        st.info("Report will include: Current conditions, risk assessment, forecasts, and AI analysis")
-
-with export_col2:
-    if st.button("📈 Export Data (CSV)"):
-        st.success("Data export initiated...")
-        st.info("Exporting: Weather data, predictions, and analysis results")
-
-with export_col3:
-    if st.button("🔗 Generate API Endpoint"):
-        st.success("API endpoint generated...")
-        st.code("https://api.nexusweather.com/v1/location/{location}/analysis")
+@st.fragment
+def export_panel():
+    """Export buttons; clicking one reruns only this row"""
+    export_col1, export_col2, export_col3, export_col4 = st.columns(4)
+    
+    with export_col1:
+        if st.button("📄 Generate PDF Report", type="primary"):
+            st.success("PDF report generation initiated...")
+            st.info("Report will include: Current conditions, risk assessment, forecasts, and AI analysis")
+    
+    with export_col2:
+        if st.button("📈 Export Data (CSV)"):
+            st.success("Data export initiated...")
+            st.info("Exporting: Weather data, predictions, and analysis results")
+    
+    with export_col3:
+        if st.button("🔗 Generate API Endpoint"):
+            st.success("API endpoint generated...")
+            st.code("https://api.nexusweather.com/v1/location/{location}/analysis")
+    
+    with export_col4:
+        if st.button("📧 Schedule Email Report"):
+            st.success("Email report scheduled...")
+            st.info("Daily reports will be sent to configured recipients")
 
-with export_col4:
-    if st.button("📧 Schedule Email Report"):
-        st.success("Email report scheduled...")
-        st.info("Daily reports will be sent to configured recipients")
+export_panel()
 
 # --- Footer with Advanced Information ---
 st.markdown("---")
-st.markdown("""
-<div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 10px; color: white;">
-    <h3>🌪️ Nexus Weather Intelligence Platform</h3>
-    <p><strong>Enterprise Meteorological Analysis System</strong></p>
-    <p>Powered by Multi-Source Data Fusion • AI-Enhanced Predictions • Real-Time Risk Assessment</p>
-    <p>Built with: Streamlit • Plotly • Folium • Gemini AI • Advanced Analytics</p>
-    <p><em>Developed for Professional Meteorologists, Emergency Managers, and Research Scientists</em></p>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(FOOTER_HTML, unsafe_allow_html=True)
 
 # --- Real-time Status Bar ---
 with st.container():
     st.markdown("### 🔄 System Status")
-    status_col1, status_col2, status_col3, status_col4, status_col5 = st.columns(5)
-    
-    with status_col1:
-        st.metric("API Status", "🟢 Online", delta="99.97% uptime")
-    
-    with status_col2:
-        st.metric("Data Sources", "🟢 Active", delta="5/5 connected")
-    
-    with status_col3:
-        st.metric("AI Models", "🟢 Ready", delta="All systems operational")
-    
-    with status_col4:
-        st.metric("Cache Status", "🟢 Optimal", delta="92% hit rate")
-    
-    with status_col5:
-        st.metric("Last Update", "🟢 Current", delta="< 1 min ago")
+    st.markdown(STATUS_HTML, unsafe_allow_html=True)
 
 # --- Development and Debug Information (Hidden by default) ---
-if st.checkbox("🔧 Developer Mode", value=False):
-    st.markdown("### 🛠️ Developer Information")
-    
-    debug_col1, debug_col2 = st.columns(2)
-    
-    with debug_col1:
-        st.subheader("System Configuration")
-        st.json({
-            "streamlit_version": st.__version__,
-            "python_version": "3.11+",
-            "api_endpoints": list(WEATHER_APIS.keys()),
-            "cache_enabled": True,
-            "multi_threading": True,
-            "async_operations": True
-        })
-    
-    with debug_col2:
-        st.subheader("Performance Metrics")
-        st.json({
-            "memory_usage": "145 MB",
-            "cpu_usage": "12%",
-            "active_connections": 3,
-            "requests_per_minute": 24,
-            "error_rate": "0.03%"
-        })
+@st.fragment
+def developer_panel():
+    """Debug information; toggling or reading it does not rerun the rest of the page"""
+    if st.checkbox("🔧 Developer Mode", value=False):
+        st.markdown("### 🛠️ Developer Information")
+        
+        # Only counted while the developer panel is open, so normal reruns skip the state write
+        st.session_state.request_count = st.session_state.get('request_count', 0) + 1
+        
+        debug_col1, debug_col2 = st.columns(2)
+        
+        with debug_col1:
+            st.subheader("System Configuration")
+            st.json({
+                "streamlit_version": st.__version__,
+                "python_version": "3.11+",
+                "api_endpoints": list(WEATHER_APIS.keys()),
+                "cache_enabled": True,
+                "multi_threading": True,
+                "async_operations": True
+            })
+        
+        with debug_col2:
+            st.subheader("Performance Metrics")
+            st.json({
+                "memory_usage": "145 MB",
+                "cpu_usage": "12%",
+                "active_connections": 3,
+                "requests_per_minute": 24,
+                "error_rate": "0.03%",
+                "session_requests": st.session_state.request_count
+            })
+
+developer_panel()
 
 # --- Advanced Error Handling and Logging ---
 def log_error(error_type, error_message):
     """Advanced error logging system"""
-    timestamp = datetime.datetime.now().isoformat()
+    # Session start wall-clock plus a monotonic offset; no datetime formatting per call
     log_entry = {
-        "timestamp": timestamp,
+        "timestamp": st.session_state.get('session_started_at'),
+        "offset_ns": time.monotonic_ns() - st.session_state.get('session_start_ns', 0),
         "error_type": error_type,
         "message": error_message,
         "session": st.session_state.get('session_id', 'unknown')
@@ -1170,8 +1576,9 @@ def log_error(error_type, error_message):
 
 # --- Session State Management ---
 if 'session_initialized' not in st.session_state:
+    session_start = datetime.datetime.now()
     st.session_state.session_initialized = True
-    st.session_state.session_id = f"nexus_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    st.session_state.session_id = f"nexus_{session_start.strftime('%Y%m%d_%H%M%S')}"
+    st.session_state.session_started_at = session_start.isoformat()
+    st.session_state.session_start_ns = time.monotonic_ns()
     st.session_state.request_count = 0
-
-st.session_state.request_count += 1